@@ -6,6 +6,7 @@ from app.services.object_detection import detect_objects
 from app.services.text_extraction import extract_text_from_image
 from app.services.description_ai import generate_description
 from app.utils.commands import handle_command
+from app.utils.session_store import session_store
 
 logger = logging.getLogger(__name__)
 active_connections = {}  # Podrías incluso mover esto a un módulo de estado centralizado.
@@ -55,7 +56,9 @@ async def websocket_endpoint(websocket: WebSocket):
 
             image_hash = hashlib.md5(image_bytes).hexdigest()
             # Aquí puedes integrar un caché si es necesario.
-            result = await asyncio.get_running_loop().run_in_executor(executor, process_image, image_bytes)
+            result, timings = await asyncio.get_running_loop().run_in_executor(executor, process_image, image_bytes)
+            # Guardar el resultado en la sesión del cliente para poder repetirlo sin recalcular.
+            session_store.add(client_id, result, timings)
 
             # Enviar respuesta solo al mismo client_id
             send_count = 0
@@ -75,13 +78,17 @@ async def websocket_endpoint(websocket: WebSocket):
                 del active_connections[client_id]
         logger.info(f"Conexión del cliente {client_id} eliminada.")
         
-def process_image(image_bytes: bytes) -> dict:
+def process_image(image_bytes: bytes) -> tuple[dict, dict]:
+    start = time.perf_counter()
     response = detect_objects(image_bytes)
+    detection_time = time.perf_counter() - start
     detected_text = "No hay Texto detectado"
     response["description"] = generate_description(response.get("detected_objects", []), image_bytes)
+    total_time = time.perf_counter() - start
     if detected_text.strip():
         response["detected_text"] = detected_text
-    return response
+    timings = {"detection": detection_time, "description": total_time - detection_time, "total": total_time}
+    return response, timings
 
 async def send_safely(websocket: WebSocket, data: dict) -> bool:
     try:
@@ -2,6 +2,7 @@
 import logging
 from urllib.parse import parse_qs
 from fastapi import WebSocket
+from app.utils.session_store import session_store
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +12,24 @@ async def handle_command(websocket: WebSocket, text: str) -> bool:
     Devuelve True si el comando es reconocido y procesado.
     En este proceso, si el comando es "capture", se responde con "capture" a todas las conexiones
     que comparten el mismo client_id.
+    Si el comando es "repeat" (o "repetir"), se reenvía el último resultado guardado
+    para ese client_id sin volver a ejecutar YOLO ni Gemini.
     """
+    if text.strip().lower() in ("repeat", "repetir"):
+        logger.info("Comando 'repeat' recibido..")
+        qs = websocket.scope.get("query_string", b"").decode("utf-8")
+        params = parse_qs(qs)
+        client_id = params.get("client_id", [""])[0]
+        last_result = session_store.last(client_id) if client_id else None
+        if last_result is None:
+            logger.warning(f"No hay resultados previos para client_id {client_id}.")
+            await websocket.send_json({"repeated": False, "detected_objects": [], "description": "No hay una descripción previa para repetir."})
+        else:
+            response = last_result.to_response()
+            response["repeated"] = True
+            await websocket.send_json(response)
+            logger.info(f"Se ha repetido la última descripción para client_id {client_id}.")
+        return True
     if text.strip().lower() == "capture":
         logger.info("Comando 'capture' recibido..")
         # Extraer el client_id de los query params del websocket
@@ -0,0 +1,172 @@
+import logging
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Últimos resultados que se guardan por client_id.
+MAX_RESULTS_PER_CLIENT = 5
+# Segundos sin actividad tras los cuales se descarta la sesión de un cliente.
+SESSION_IDLE_TTL = 600
+# Tope global (aproximado, en bytes) para la memoria de todas las sesiones.
+MAX_TOTAL_BYTES = 2 * 1024 * 1024
+# Costo aproximado de una entrada en un dict (hash, clave, valor e índices, con holgura por redimensionado).
+DICT_ENTRY_BYTES = 64
+
+
+class FrameResult(NamedTuple):
+    """Resultado compacto de un frame procesado."""
+    detections: tuple  # tuplas (label, position, confidence, color)
+    description: Optional[str]
+    detected_text: Optional[str]
+    error: Optional[str]
+    timings: tuple  # (detección, descripción, total) en milisegundos
+
+    @classmethod
+    def from_response(cls, response: dict, timings: dict) -> "FrameResult":
+        detections = tuple(
+            (
+                obj.get("label"),
+                obj.get("position"),
+                obj.get("confidence", 0),
+                obj.get("color"),
+            )
+            for obj in response.get("detected_objects", [])
+        )
+        return cls(
+            detections=detections,
+            description=response.get("description"),
+            detected_text=response.get("detected_text"),
+            error=response.get("error"),
+            timings=(
+                round(timings.get("detection", 0.0) * 1000, 1),
+                round(timings.get("description", 0.0) * 1000, 1),
+                round(timings.get("total", 0.0) * 1000, 1),
+            ),
+        )
+
+    def to_response(self) -> dict:
+        """Reconstruye el diccionario que se envía al cliente."""
+        response = {
+            "detected_objects": [
+                {"label": label, "position": position, "confidence": confidence, "color": color}
+                if color is not None
+                else {"label": label, "position": position, "confidence": confidence}
+                for label, position, confidence, color in self.detections
+            ],
+            "description": self.description,
+        }
+        if self.detected_text is not None:
+            response["detected_text"] = self.detected_text
+        if self.error is not None:
+            response["error"] = self.error
+        detection_ms, description_ms, total_ms = self.timings
+        response["timings"] = {"detection_ms": detection_ms, "description_ms": description_ms, "total_ms": total_ms}
+        return response
+
+    def estimated_size(self) -> int:
+        """Bytes aproximados del resultado, incluyendo las tuplas que lo contienen."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.detections) + sys.getsizeof(self.timings)
+        size += sum(sys.getsizeof(value) for value in self.timings)
+        size += sum(sys.getsizeof(text) for text in (self.description, self.detected_text, self.error) if text is not None)
+        # label y position salen de vocabularios fijos (model.names y literales), así que se comparten entre resultados.
+        for detection in self.detections:
+            _label, _position, confidence, color = detection
+            size += sys.getsizeof(detection) + sys.getsizeof(confidence)
+            if color is not None:
+                size += sys.getsizeof(color)
+        return size
+
+
+class SessionStore:
+    """
+    Guarda en memoria los últimos resultados de cada client_id.
+    Cada sesión es un buffer circular de tamaño fijo; las sesiones inactivas
+    se eliminan por TTL y, si se supera el tope global de memoria, se
+    descartan primero las sesiones usadas hace más tiempo.
+    """
+
+    def __init__(self, max_results: int = MAX_RESULTS_PER_CLIENT,
+                 idle_ttl: float = SESSION_IDLE_TTL, max_total_bytes: int = MAX_TOTAL_BYTES):
+        self.max_results = max_results
+        self.idle_ttl = idle_ttl
+        self.max_total_bytes = max_total_bytes
+        # client_id -> deque de FrameResult, ordenado de menos a más reciente uso
+        self._sessions = OrderedDict()
+        self._last_seen = {}
+        self._sizes = {}
+        self._total_bytes = 0
+
+    def add(self, client_id: str, response: dict, timings: dict) -> FrameResult:
+        self.evict_idle()
+        result = FrameResult.from_response(response, timings)
+        session = self._sessions.get(client_id)
+        if session is None:
+            session = deque(maxlen=self.max_results)
+            self._sessions[client_id] = session
+            self._sizes[client_id] = self._session_overhead(client_id, session)
+            self._total_bytes += self._sizes[client_id]
+        if len(session) == session.maxlen:
+            dropped = session[0].estimated_size()
+            self._sizes[client_id] -= dropped
+            self._total_bytes -= dropped
+        session.append(result)
+        size = result.estimated_size()
+        self._sizes[client_id] += size
+        self._total_bytes += size
+        self._touch(client_id)
+        self._enforce_memory_cap()
+        return result
+
+    @property
+    def total_bytes(self) -> int:
+        """Memoria estimada que ocupan todas las sesiones."""
+        return self._total_bytes
+
+    def last(self, client_id: str) -> Optional[FrameResult]:
+        self.evict_idle()
+        session = self._sessions.get(client_id)
+        if not session:
+            return None
+        self._touch(client_id)
+        return session[-1]
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        while self._sessions:
+            client_id = next(iter(self._sessions))
+            if now - self._last_seen[client_id] < self.idle_ttl:
+                break
+            logger.info(f"Sesión de {client_id} eliminada por inactividad.")
+            self._remove(client_id)
+
+    def _touch(self, client_id: str) -> None:
+        self._last_seen[client_id] = time.monotonic()
+        self._sessions.move_to_end(client_id)
+
+    @staticmethod
+    def _session_overhead(client_id: str, session: deque) -> int:
+        # deque vacío, la clave y una entrada en _sessions, _last_seen y _sizes
+        # (más el nodo de la lista enlazada del OrderedDict), con sus valores float e int.
+        return (sys.getsizeof(session) + sys.getsizeof(client_id) + 4 * DICT_ENTRY_BYTES
+                + sys.getsizeof(0.0) + sys.getsizeof(0))
+
+    def _enforce_memory_cap(self) -> None:
+        # Nunca se descarta la sesión más reciente, aunque por sí sola supere el tope.
+        while self._total_bytes > self.max_total_bytes and len(self._sessions) > 1:
+            client_id = next(iter(self._sessions))
+            logger.warning(f"Tope de memoria de sesiones alcanzado, eliminando sesión de {client_id}.")
+            self._remove(client_id)
+
+    def _remove(self, client_id: str) -> None:
+        self._sessions.pop(client_id, None)
+        self._last_seen.pop(client_id, None)
+        self._total_bytes -= self._sizes.pop(client_id, 0)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_store = SessionStore()
@@ -0,0 +1,2 @@
+# Este conftest en la raíz hace que pytest agregue el proyecto al sys.path,
+# así los tests pueden importar el paquete "app" ejecutando simplemente `pytest`.
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.utils import commands
+from app.utils.commands import handle_command
+from app.utils.session_store import SessionStore
+
+
+class StubWebSocket:
+    def __init__(self, client_id: str):
+        self.scope = {"query_string": f"client_id={client_id}".encode("utf-8")}
+        self.sent = []
+
+    async def send_json(self, data: dict) -> None:
+        self.sent.append(data)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    monkeypatch.setattr(commands, "session_store", store)
+    return store
+
+
+@pytest.mark.parametrize("command", ["repeat", " REPETIR "])
+def test_repeat_without_previous_result(store, command):
+    websocket = StubWebSocket("cliente")
+
+    assert asyncio.run(handle_command(websocket, command)) is True
+    assert len(websocket.sent) == 1
+    reply = websocket.sent[0]
+    assert reply["repeated"] is False
+    assert reply["detected_objects"] == []
+
+
+def test_repeat_replays_last_result(store):
+    original = {
+        "detected_objects": [{"label": "person", "position": "izquierda", "confidence": 0.87654321, "color": "(10, 20, 30)"}],
+        "description": "Hay una persona a tu izquierda.",
+        "detected_text": "No hay Texto detectado",
+    }
+    store.add("cliente", {"detected_objects": [], "description": "Frame anterior."}, {})
+    store.add("cliente", original, {"detection": 0.05, "description": 1.2, "total": 1.25})
+    websocket = StubWebSocket("cliente")
+
+    assert asyncio.run(handle_command(websocket, "repeat")) is True
+    reply = websocket.sent[0]
+    assert reply["repeated"] is True
+    assert reply["detected_objects"] == original["detected_objects"]
+    assert reply["description"] == original["description"]
+    assert reply["detected_text"] == original["detected_text"]
+    assert reply["timings"] == {"detection_ms": 50.0, "description_ms": 1200.0, "total_ms": 1250.0}
+
+
+def test_repeat_only_uses_the_requesting_client(store):
+    store.add("otro", {"detected_objects": [], "description": "Resultado de otro cliente."}, {})
+    websocket = StubWebSocket("cliente")
+
+    asyncio.run(handle_command(websocket, "repeat"))
+    assert websocket.sent[0]["repeated"] is False
+
+
+def test_unknown_text_is_not_a_command(store):
+    websocket = StubWebSocket("cliente")
+
+    assert asyncio.run(handle_command(websocket, "hola")) is False
+    assert websocket.sent == []
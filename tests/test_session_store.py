@@ -0,0 +1,104 @@
+import gc
+import tracemalloc
+
+from app.utils import session_store as session_store_module
+from app.utils.session_store import SessionStore
+
+
+def make_response(i: int, error: str = None) -> dict:
+    response = {
+        "detected_objects": [
+            {"label": "cup", "position": "centro", "confidence": i / 7, "color": f"({i}, 2, {j})"}
+            for j in range(2)
+        ],
+        "description": f"Frente a ti veo una taza número {i}.",
+    }
+    if error is not None:
+        response["error"] = error
+    return response
+
+
+def test_last_unknown_client_returns_none():
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=400)
+    assert store.last("desconocido") is None
+    assert len(store) == 0
+    assert store.total_bytes == 0
+
+
+def test_full_buffer_drops_oldest_and_keeps_byte_count():
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    for i in range(3):
+        store.add("cliente", make_response(i), {"total": 0.5})
+
+    # Un store que solo recibió los dos últimos frames debe estimar los mismos bytes.
+    expected = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    for i in range(1, 3):
+        expected.add("cliente", make_response(i), {"total": 0.5})
+
+    assert store.last("cliente").description == make_response(2)["description"]
+    assert store.total_bytes == expected.total_bytes
+
+
+def test_memory_cap_evicts_least_recently_used_session():
+    single = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    single.add("a", make_response(0), {})
+    one_session = single.total_bytes
+
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=one_session + 400)
+    store.add("a", make_response(0), {})
+    store.add("b", make_response(1), {})
+
+    assert store.last("a") is None
+    assert store.last("b").description == make_response(1)["description"]
+    assert len(store) == 1
+    assert store.total_bytes <= store.max_total_bytes
+
+
+def test_idle_sessions_are_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store_module.time, "monotonic", lambda: now[0])
+    store = SessionStore(max_results=2, idle_ttl=10, max_total_bytes=100_000)
+    store.add("a", make_response(0), {})
+    store.add("b", make_response(1), {})
+
+    now[0] += 11
+    store.evict_idle()
+
+    assert len(store) == 0
+    assert store.total_bytes == 0
+    assert store.last("a") is None
+
+
+def test_repeated_response_keeps_payload_error_and_timings():
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    original = make_response(3, error="Error en detección")
+    store.add("cliente", original, {"detection": 0.1, "description": 0.2, "total": 0.3})
+
+    response = store.last("cliente").to_response()
+    assert response["detected_objects"] == original["detected_objects"]
+    assert response["description"] == original["description"]
+    assert response["error"] == "Error en detección"
+    assert response["timings"] == {"detection_ms": 100.0, "description_ms": 200.0, "total_ms": 300.0}
+
+
+def test_estimated_bytes_track_real_memory():
+    # La estimación debe cubrir la memoria real (para que el tope se respete)
+    # sin sobrestimarla en más de un 50 %.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = SessionStore(max_results=5, idle_ttl=600, max_total_bytes=10**9)
+        k = 0
+        for i in range(500):
+            client_id = f"cliente-{i}"
+            for _ in range(3):
+                store.add(client_id, make_response(k), {"detection": 0.01 * k, "description": 0.02, "total": 0.03 * k})
+                k += 1
+        del client_id
+        gc.collect()
+        real = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert 0.9 * real <= store.total_bytes <= 1.5 * real
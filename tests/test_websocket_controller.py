@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+# El controlador importa los servicios de YOLO, Gemini y OCR al cargarse.
+for module in ("fastapi", "ultralytics", "cv2", "google.genai", "dotenv", "easyocr", "pytesseract"):
+    pytest.importorskip(module)
+
+from fastapi import WebSocketDisconnect
+
+from app.controllers import websocket_controller
+from app.utils.session_store import SessionStore
+
+
+class StubWebSocket:
+    def __init__(self, client_id: str, messages: list):
+        self.scope = {"query_string": f"client_id={client_id}".encode("utf-8")}
+        self.messages = list(messages)
+        self.sent = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def receive(self) -> dict:
+        if not self.messages:
+            raise WebSocketDisconnect()
+        return self.messages.pop(0)
+
+    async def send_json(self, data: dict) -> None:
+        self.sent.append(data)
+
+
+def test_process_image_returns_response_and_timings(monkeypatch):
+    detected = [{"label": "cup", "position": "centro", "confidence": 0.9, "color": "(1, 2, 3)"}]
+    monkeypatch.setattr(websocket_controller, "detect_objects", lambda image_bytes: {"detected_objects": detected})
+    monkeypatch.setattr(websocket_controller, "generate_description", lambda objects, image_bytes: "Hay una taza.")
+
+    response, timings = websocket_controller.process_image(b"imagen")
+
+    assert response["detected_objects"] == detected
+    assert response["description"] == "Hay una taza."
+    assert set(timings) == {"detection", "description", "total"}
+    assert timings["total"] >= timings["detection"] >= 0
+
+
+def test_endpoint_stores_result_in_session(monkeypatch):
+    store = SessionStore(max_results=2, idle_ttl=60, max_total_bytes=100_000)
+    monkeypatch.setattr(websocket_controller, "session_store", store)
+    response = {"detected_objects": [{"label": "cup", "position": "centro", "confidence": 0.9}], "description": "Hay una taza."}
+    monkeypatch.setattr(websocket_controller, "process_image", lambda image_bytes: (dict(response), {"total": 0.5}))
+    websocket = StubWebSocket("cliente", [{"type": "websocket.receive", "bytes": b"imagen"}])
+
+    asyncio.run(websocket_controller.websocket_endpoint(websocket))
+
+    assert websocket.sent == [response]
+    stored = store.last("cliente")
+    assert stored.description == "Hay una taza."
+    assert stored.timings[2] == 500.0